@@ -1,26 +1,126 @@
 from collections import deque
-from itertools import permutations, combinations
-from gurobipy import Model, GRB, quicksum
 import time
-import requests
 import json
 import pandas as pd
 import ast
-import random
-import csv
+import os
 import numpy as np
+from scipy import sparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import ot
+except ImportError:  # POT is optional; EMD falls back to the Gurobi LP
+    ot = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; floyd_warshall falls back to NumPy
+    njit = None
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _fw_numba(dist):
+        """In-place Floyd-Warshall on a contiguous float64 matrix, parallel over rows."""
+        n = dist.shape[0]
+        for k in range(n):
+            row_k = dist[k]
+            for i in prange(n):
+                dik = dist[i, k]
+                if dik == np.inf:
+                    continue
+                row_i = dist[i]
+                for j in range(n):
+                    v = dik + row_k[j]
+                    if v < row_i[j]:
+                        row_i[j] = v
+else:
+    _fw_numba = None
+
+
+# gurobipy is imported on first use by _load_gurobi(): its import runs the license check and logging
+# setup, and it is only needed when EMDs are solved with Gurobi
+Model = GRB = quicksum = None
+
+
+def _load_gurobi():
+    """Import the gurobipy names into module globals the first time a Gurobi model is needed."""
+    global Model, GRB, quicksum
+    if Model is None:
+        from gurobipy import Model, GRB, quicksum
+
+
+def _parse_id_list(text):
+    """Parse a stringified Python list of ids such as "['1', '2']", using json when the text allows it."""
+    try:
+        return json.loads(text.replace("'", '"'))
+    except json.JSONDecodeError:
+        return ast.literal_eval(text)  # e.g. lists containing None
+
+
+# Distance matrix mapped from shared memory inside each ORC worker process
+_worker_shm = None
+_worker_distance_matrix = None
+
+
+def _attach_distance_matrix(shm_name, shape):
+    """Process pool initializer: map the shared distance matrix into this worker without copying it."""
+    global _worker_shm, _worker_distance_matrix
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_distance_matrix = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+
+
+def _compute_hyperedge_orc(hyperedge_id, node_probs, weight):
+    """
+    ORC of one hyperedge, run inside a worker process.
+
+    :param node_probs: For each node of the hyperedge, (support indices, probabilities) of its node_probability.
+    :param weight: Current weight of the hyperedge.
+    :return: (hyperedge_id, orc), matching earthmover_distance_hyperedge_combinations.
+    """
+    if len(node_probs) < 2:
+        return hyperedge_id, 1
+
+    # Enumerate the node pairs as index arrays (same order as combinations) and dispatch straight into POT
+    pair_i, pair_j = np.triu_indices(len(node_probs), k=1)
+    emds = np.empty(len(pair_i), dtype=np.float64)
+    for k, (a, b) in enumerate(zip(pair_i.tolist(), pair_j.tolist())):
+        idx_A, mu_A = node_probs[a]
+        idx_B, mu_B = node_probs[b]
+        emds[k] = ot.emd2(mu_A, mu_B, _worker_distance_matrix[np.ix_(idx_A, idx_B)])
+
+    average_emd = float(emds.mean())
+    if weight == 0:
+        return hyperedge_id, 1 - average_emd
+    return hyperedge_id, 1 - average_emd / weight
+
 
 class UndirectedHypergraph:
     '''Initializing the hypergraph'''
     def __init__(self):
         self.nodes = set()
         self.hyperedges = {}
-        self.weights = {}
         self.ricci_curvature = {}
+        self._edge_ids = []  # Hyperedge ids in insertion order (None once removed); position = slot in the weight arrays
+        self._edge_idx = {}  # hyperedge id -> slot in self._current_weight
+        self._current_weight = np.empty(0, dtype=np.float64)  # Current weight of every hyperedge slot
+        self._weight_history = []  # One snapshot of the current weights per iteration
+        self._incidence = {}  # node -> set of ids of the hyperedges containing it
+        self._prob_cache = {}  # node -> node_probability(node)
+        self._emd_cache = {}  # frozenset({node_A, node_B}) -> EMD for the current distance matrix
+        self._node_list = None  # Fixed node order (rows/columns of distance matrices), rebuilt lazily
+        self._node_idx = None  # node -> position in self._node_list
+        self._H = None  # Sparse node x hyperedge incidence matrix, rebuilt lazily after structural changes
+        self._pairs = None  # (pair_i, pair_j, pair_slot) node-pair arrays of all hyperedges, rebuilt lazily
+        self._adj = None  # Per-node neighbour position arrays, rebuilt lazily
 
     '''Function to add a node to the hypergraph'''
     def add_node(self,node):
         self.nodes.add(node)
+        self._invalidate_structure()
         print(f"Node added: {node}")
 
     """Add a hyperedge to the hypergraph. Automatically adds missing nodes."""
@@ -40,9 +140,45 @@ class UndirectedHypergraph:
 
         # Add the hyperedge
         self.hyperedges[hyperedge_id] = nodes
-        self.weights[hyperedge_id] = [1]
+        slot = len(self._edge_ids)
+        self._edge_idx[hyperedge_id] = slot
+        self._edge_ids.append(hyperedge_id)
+        if slot >= len(self._current_weight):
+            # Grow geometrically so building a large hypergraph stays linear
+            grown = np.empty(max(16, 2 * len(self._current_weight)), dtype=np.float64)
+            grown[:slot] = self._current_weight[:slot]
+            self._current_weight = grown
+        self._current_weight[slot] = 1.0
+        for node in nodes:
+            self._incidence.setdefault(node, set()).add(hyperedge_id)
+        self._invalidate_structure()
         print(f"Hyperedge {hyperedge_id} added with nodes {nodes}")
 
+    '''Drop memoized probabilities and EMDs; call whenever the structure or the distance matrix changes'''
+    def clear_caches(self):
+        self._prob_cache.clear()
+        self._emd_cache.clear()
+
+    '''Drop everything derived from the node and hyperedge sets so it is rebuilt on next use'''
+    def _invalidate_structure(self):
+        self._node_list = None
+        self._node_idx = None
+        self._H = None
+        self._pairs = None
+        self._adj = None
+        self.clear_caches()
+
+    def node_index(self):
+        """
+        Fixed integer indexing of the nodes, shared by the distance matrices and node probabilities.
+
+        :return: (node_list, node_idx) where node_idx maps each node to its position in node_list.
+        """
+        if self._node_list is None:
+            self._node_list = list(self.nodes)
+            self._node_idx = {node: idx for idx, node in enumerate(self._node_list)}
+        return self._node_list, self._node_idx
+
     '''Function to add ollivier ricci curvature for all hyperedges for every iteration'''
     def add_ricci_curvature(self, hyperedge_id, orc):
         if hyperedge_id not in self.ricci_curvature:
@@ -50,18 +186,34 @@ class UndirectedHypergraph:
 
         self.ricci_curvature[hyperedge_id].append(orc)
 
-    '''Function to add weights for all hyperedges for every iteration'''
+    '''Function to set the weight of a hyperedge for the current iteration'''
     def add_weights(self, hyperedge_id, weights):
         if weights is not None:
-            self.weights[hyperedge_id].append(weights)
+            self._current_weight[self._edge_idx[hyperedge_id]] = weights
+
+    '''Function to get the current weight of a hyperedge'''
+    def current_weight(self, hyperedge_id):
+        return self._current_weight[self._edge_idx[hyperedge_id]]
+
+    '''Function to get the current weights of several hyperedges as an array'''
+    def current_weights(self, hyperedge_ids):
+        return self._current_weight[[self._edge_idx[hyperedge_id] for hyperedge_id in hyperedge_ids]]
+
+    '''Function to set the weights of several hyperedges at once for the current iteration'''
+    def set_weights(self, hyperedge_ids, weights):
+        self._current_weight[[self._edge_idx[hyperedge_id] for hyperedge_id in hyperedge_ids]] = weights
+
+    '''Function to store a snapshot of all hyperedge weights, once per iteration'''
+    def record_weights(self):
+        self._weight_history.append(self._current_weight[:len(self._edge_ids)].copy())
 
 
     '''Build hypergraph from a DataFrame'''
     def build_from_dataframe(self, df):
-        for _, row in df.iterrows():
-            paper_id = row['paper_id']
-            author_ids = ast.literal_eval(row['author_ids'])
-            self.add_hyperedge(paper_id, author_ids)
+        # Parse the whole column up front and walk plain arrays instead of boxing every row with iterrows
+        author_ids = df['author_ids'].map(_parse_id_list)
+        for paper_id, ids in zip(df['paper_id'].to_numpy(), author_ids.to_numpy()):
+            self.add_hyperedge(paper_id, ids)
 
     '''Retrieve authors for a given paper_id'''
     def get_authors_by_paper_id(self, paper_id):
@@ -75,7 +227,7 @@ class UndirectedHypergraph:
         """Calculate the degree of a node. Degree is the number of hyperedges containing this node."""
         if node not in self.nodes:
             raise ValueError("Node does not exist in the graph.")
-        return sum(node in hyperedge for hyperedge in self.hyperedges.values())
+        return len(self._incidence.get(node, ()))
 
     def neighbours(self, node):
         """
@@ -88,46 +240,88 @@ class UndirectedHypergraph:
             return set()  # Return an empty set if the node does not exist
 
         neighbours = set()
-        # Iterate through all hyperedges
-        for hyperedge in self.hyperedges.values():
-            if node in hyperedge:
-                neighbours.update(hyperedge)  # Add all nodes in the hyperedge
+        # Only visit the hyperedges that contain the node
+        for hyperedge_id in self._incidence.get(node, ()):
+            neighbours.update(self.hyperedges[hyperedge_id])  # Add all nodes in the hyperedge
 
         neighbours.discard(node)  # Remove the node itself from the set of neighbours
         return neighbours
 
-    def floyd_warshall(self):
-        node_list = list(self.nodes)
-        index = {node: idx for idx, node in enumerate(node_list)}
-        n = len(node_list)
-        dist = [[float('inf') for _ in range(n)] for _ in range(n)]
-        
-        for i in range(n):
-            dist[i][i] = 0
-        
+    def incidence_matrix(self):
+        """
+        Build (or reuse) the sparse incidence matrix H, with H[v, e] = 1 if node v is in hyperedge e.
+
+        :return: The CSR matrix H; rows follow node_index() and columns follow self._H_edge_ids.
+        """
+        if self._H is not None:
+            return self._H
+
+        node_list, node_idx = self.node_index()
+        edge_ids = list(self.hyperedges)
+
+        rows, cols = [], []
+        for col, hyperedge_id in enumerate(edge_ids):
+            for node in set(self.hyperedges[hyperedge_id]):
+                rows.append(node_idx[node])
+                cols.append(col)
+
+        H = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(node_list), len(edge_ids)))
+        self._H_edge_ids = edge_ids
+        self._H_edge_sizes = np.array([len(self.hyperedges[h]) for h in edge_ids], dtype=np.float64)
+        self._H_degree = H.getnnz(axis=1)
+        # node_probability denominators for every node at once: sum of (|f| - 1) over f containing the node
+        self._H_denominator = H @ (self._H_edge_sizes - 1)
+        self._H = H
+        return H
+
+    def hyperedge_pairs(self):
+        """
+        Flatten every hyperedge into its node pairs, as three aligned integer arrays.
+
+        :return: (pair_i, pair_j, pair_slot): node indices (in node_index() order) of each pair
+                 and the weight slot of the hyperedge it comes from.
+        """
+        if self._pairs is not None:
+            return self._pairs
+
+        _, index = self.node_index()
+        pair_i, pair_j, pair_slot = [], [], []
         for hyperedge_id, nodes in self.hyperedges.items():
-            weight = self.weights[hyperedge_id][-1]
-            for i in range(len(nodes)):
-                for j in range(i + 1, len(nodes)):
-                    idx_i = index[nodes[i]]
-                    idx_j = index[nodes[j]]
-                    if dist[idx_i][idx_j] > weight:
-                        dist[idx_i][idx_j] = weight
-                        dist[idx_j][idx_i] = weight  # Graph is undirected
+            idx = np.fromiter((index[node] for node in nodes), dtype=np.intp, count=len(nodes))
+            first, second = np.triu_indices(len(idx), k=1)
+            pair_i.append(idx[first])
+            pair_j.append(idx[second])
+            pair_slot.append(np.full(len(first), self._edge_idx[hyperedge_id], dtype=np.intp))
+
+        if pair_i:
+            self._pairs = (np.concatenate(pair_i), np.concatenate(pair_j), np.concatenate(pair_slot))
+        else:
+            self._pairs = (np.empty(0, dtype=np.intp),) * 3
+        return self._pairs
 
-        for k in range(n):
-            for i in range(n):
-                for j in range(n):
-                    if dist[i][j] > dist[i][k] + dist[k][j]:
-                        dist[i][j] = dist[i][k] + dist[k][j]
-                        dist[j][i] = dist[i][j]
+    def floyd_warshall(self):
+        n = len(self.node_index()[0])
+        dist = np.full((n, n), np.inf, dtype=np.float64)
+
+        # Every pair inside a hyperedge is joined with the hyperedge weight (graph is undirected)
+        pair_i, pair_j, pair_slot = self.hyperedge_pairs()
+        np.minimum.at(dist, (pair_i, pair_j), self._current_weight[pair_slot])
+        dist = np.minimum(dist, dist.T)
+        np.fill_diagonal(dist, 0.0)
+
+        if _fw_numba is not None:
+            _fw_numba(dist)
+            dist = np.minimum(dist, dist.T)  # Graph is undirected
+        else:
+            # Relax all pairs through k at once instead of looping over i and j
+            for k in range(n):
+                np.minimum(dist, dist[:, k:k + 1] + dist[k], out=dist)
 
-         # Replace 'inf' with 0 for pairs of nodes that have no path between them
-        for i in range(n):
-            for j in range(n):
-                if dist[i][j] == float('inf'):
-                    dist[i][j] = 0 
+        # Replace 'inf' with 0 for pairs of nodes that have no path between them
+        dist[np.isinf(dist)] = 0
 
+        # Shared read-only by every EMD computed from it
+        dist.setflags(write=False)
         return dist
 
     def find_shortest_distance(self, start, end):
@@ -147,35 +341,33 @@ class UndirectedHypergraph:
 
         max_distance = 3  # Maximum distance allowed
         queue = deque([(start, 0)])
-        visited = set([start])  # Set to keep track of visited nodes
+        visited_nodes = {start}  # Set to keep track of visited nodes
+        visited_edges = set()  # Hyperedges already expanded; their nodes are all queued
 
         while queue:
             current_node, current_distance = queue.popleft()
 
-            if current_distance == max_distance:
-                if current_node == end:
-                    return current_distance
-                continue  # Do not expand this node further if max distance reached
-
-            # Traverse each hyperedge in the graph
-            for hyperedge in self.hyperedges.values():
-                if current_node in hyperedge:
-                    # Check each node in the current hyperedge
-                    for node in hyperedge:
-                        if node == end:
-                            return current_distance + 1  # Found the end node, return the distance
-                        if node not in visited:
-                            visited.add(node)
-                            queue.append((node, current_distance + 1))
-
-        return 0  # Return 3 if no path is found within the limit
+            # Only expand hyperedges of the current node that have not been expanded yet
+            for hyperedge_id in self._incidence.get(current_node, set()) - visited_edges:
+                visited_edges.add(hyperedge_id)
+                for node in self.hyperedges[hyperedge_id]:
+                    if node == end:
+                        return current_distance + 1  # Found the end node, return the distance
+                    # Nodes at the maximum distance are never expanded, so do not queue them
+                    if node not in visited_nodes and current_distance + 1 < max_distance:
+                        visited_nodes.add(node)
+                        queue.append((node, current_distance + 1))
+
+        return max_distance  # Return 3 if no path is found within the limit
     
     def calculate_distance_matrix(self):
-        n = len(self.nodes)
-        distance_matrix = [[0 for _ in range(n)] for _ in range(n)]
-        for i, node1 in enumerate(self.nodes):
-            for j, node2 in enumerate(self.nodes):
-                distance_matrix[i][j] = self.find_shortest_distance(node1, node2)
+        node_list, _ = self.node_index()
+        n = len(node_list)
+        distance_matrix = np.zeros((n, n), dtype=np.float64)
+        for i, node1 in enumerate(node_list):
+            for j, node2 in enumerate(node_list):
+                distance_matrix[i, j] = self.find_shortest_distance(node1, node2)
+        distance_matrix.setflags(write=False)
         return distance_matrix
     
     def diameter(self,hyperedge_id):
@@ -191,91 +383,78 @@ class UndirectedHypergraph:
         return diameter
 
     def node_probability(self, node):
+        """
+        Random-walk distribution of a node over itself and its neighbours.
+
+        :param node: The node whose distribution is computed.
+        :return: (support, probabilities): ascending node_index() positions of the nodes carrying
+                 mass and their probabilities.
+        """
+        if node in self._prob_cache:
+            return self._prob_cache[node]
+
         alpha = 0.1  # Self-transition probability factor
-        probability_distribution = {n: 0.0 for n in self.nodes}  # Initialize probabilities
 
         if node not in self.nodes:
             raise ValueError("Node does not exist in the hypergraph.")
 
-        # Calculate the denominator: sum of (|f| - 1) for all f containing node
-        denominator = 0
-        hyperedges_containing_node = self.find_hyperedges_containing_nodes(node)
-        for hyperedge_id in hyperedges_containing_node:
-            hyperedge = self.hyperedges[hyperedge_id]
-            denominator += (len(hyperedge) - 1)
+        H = self.incidence_matrix()
+        _, node_idx = self.node_index()
+        v = node_idx[node]
+        row = H[v]
+
+        # Denominator: sum of (|f| - 1) for all f containing node, precomputed for every node
+        denominator = self._H_denominator[v]
 
         if denominator == 0:
             # If the denominator is zero, we should handle this edge case gracefully.
-            probability_distribution[node] = 1.0
-            return probability_distribution
+            distribution = (np.array([v], dtype=np.intp), np.array([1.0]))
+            self._prob_cache[node] = distribution
+            return distribution
 
-        # Calculate the numerator for each neighbor node j and update their probabilities
-        for neighbour in self.neighbours(node):
-            hyperedges_containing_both = self.find_hyperedges_containing_nodes(node, neighbour)
-            numerator = len(hyperedges_containing_both)
-            '''
-            for hyperedge_id in hyperedges_containing_both:
-                hyperedge = self.hyperedges[hyperedge_id]
-                numerator += (len(hyperedge))
-            '''
-            # Update the probability of transitioning to the neighbor
-            probability_distribution[neighbour] = (1 - alpha) * numerator / denominator
+        # Number of hyperedges shared with every other node; nonzero entries are the neighbours
+        shared = (row @ H.T).toarray().ravel()
+        shared[v] = 0
+        neighbour_idx = np.flatnonzero(shared)
+
+        # The numerator counts the hyperedges containing the node or the neighbour (see
+        # find_hyperedges_containing_nodes), i.e. deg(node) + deg(neighbour) - shared
+        numerator = self._H_degree[v] + self._H_degree[neighbour_idx] - shared[neighbour_idx]
 
-        # Assign the self-loop probability
-        probability_distribution[node] = alpha
+        # Neighbours get (1 - alpha) * numerator / denominator and the node keeps the self-loop probability
+        support = np.append(neighbour_idx, v).astype(np.intp)
+        probabilities = np.append((1 - alpha) * numerator / denominator, alpha)
+        order = np.argsort(support)
+        support, probabilities = support[order], probabilities[order]
 
         # Normalization step
-        
-        total_probability = sum(probability_distribution.values())
-        for n in probability_distribution:
-            probability_distribution[n] /= total_probability
-        
-        return probability_distribution
+        probabilities /= probabilities.sum()
+
+        self._prob_cache[node] = (support, probabilities)
+        return support, probabilities
     
 
     '''Find hyperedges that contain any of the specified nodes.'''
     def find_hyperedges_containing_nodes(self, *nodes):
-        '''
-        # Ensure input is treated as a list even if a single node is passed
-        if isinstance(nodes, str):
-            nodes = [nodes]  # Convert single string node to a list
-        '''
-        nodes_set = set(nodes)  # Convert list to set for efficient intersection checks
-        #print(nodes_set)
-        # Handle different types of inputs
-        for node in nodes:
-            if isinstance(node, (list, set, tuple)):  # If the input is any kind of collection
-                nodes_set.update(node)  # Add all elements to the set
-            else:
-                nodes_set.add(node)  # Add the single element to the set
-
-        found_hyperedges = []
-        # Ensure all nodes in the set are in our nodes list
-        if not nodes_set.issubset(self.nodes):
+        if __debug__ and not self.nodes.issuperset(nodes):
             print("Some nodes are not in the hypergraph.")
-        
-        # Iterate through all hyperedges
-        for hyperedge_id, hyperedge_nodes in self.hyperedges.items():
-            if nodes_set.intersection(hyperedge_nodes):  # Check if intersection is not empty
-                found_hyperedges.append(hyperedge_id)
-        
-        return found_hyperedges
+
+        # Union of the incidence sets: hyperedges containing any of the nodes
+        return list(set().union(*(self._incidence.get(node, ()) for node in nodes)))
     
-    def earthmover_distance_gurobi_distance_matrix(self, node_A, node_B, distance_matrix):
+    def earthmover_distance_gurobi_distance_matrix(self, node_A, node_B, distance_matrix, use_gurobi=False):
         if node_A not in self.nodes or node_B not in self.nodes:
             print(f"Node {node_A} or {node_B} does not exist in the hypergraph.")
             return None  # Return None if either node does not exist
         
-        # Get the probability distributions for the two specified nodes.
-        mu_A = self.node_probability(node_A)
-        mu_B = self.node_probability(node_B)
-
-        
-        # Convert distributions from dictionary to list format and print for debugging
-        nodes_A = sorted(mu_A.keys())
-        nodes_B = sorted(mu_B.keys())
-        distribution1 = [mu_A[node] for node in nodes_A]
-        distribution2 = [mu_B[node] for node in nodes_B]
+        # Get the probability distributions for the two specified nodes, ordered by node index.
+        idx_A, distribution1 = self.node_probability(node_A)
+        idx_B, distribution2 = self.node_probability(node_B)
+
+        # Map the supports back to node names for debugging
+        node_list, _ = self.node_index()
+        nodes_A = [node_list[i] for i in idx_A]
+        nodes_B = [node_list[i] for i in idx_B]
     
         # Print the distributions to verify correctness
         print("Nodes in mu_A:", nodes_A)
@@ -284,8 +463,8 @@ class UndirectedHypergraph:
         print("Distribution mu_B:", distribution2)
 
         # Check if distributions sum to the same value
-        total_mass_A = sum(distribution1)
-        total_mass_B = sum(distribution2)
+        total_mass_A = distribution1.sum()
+        total_mass_B = distribution2.sum()
         print("Total mass in mu_A:", total_mass_A)
         print("Total mass in mu_B:", total_mass_B)
     
@@ -293,11 +472,22 @@ class UndirectedHypergraph:
             raise ValueError('The total mass of the distributions mu_A and mu_B are not equal.')
         
 
-        # Create a mapping of nodes to their indices in the distance matrix.
-        node_to_index = {node: idx for idx, node in enumerate(list(self.nodes))}
+        # Costs between the two supports, sliced once from the shared distance matrix (node_index() order).
+        cost_matrix = distance_matrix[np.ix_(idx_A, idx_B)]
+
+        if not use_gurobi and ot is not None:
+            # Solve the transport problem over the two supports only with POT's network simplex
+            start_time = time.time()
+            total_cost = float(ot.emd2(distribution1, distribution2, cost_matrix))
+            end_time = time.time()
+
+            print("Total EMD Cost:", total_cost)
+            print("Time taken to find the optimal solution: {:.4f} seconds".format(end_time - start_time))
+            return total_cost
 
         try:
             # Create a new model in Gurobi.
+            _load_gurobi()
             model = Model("EarthMoverDistance")
 
             # Set up the log file
@@ -309,18 +499,22 @@ class UndirectedHypergraph:
             '''
             #model.setParam('OutputFlag', 1)
             # Create variables for the linear program.
-            variables = model.addVars(mu_A.keys(), mu_B.keys(), name="z", lb=0)
+            # Variables are indexed by position in the two supports.
+            k_A, k_B = len(idx_A), len(idx_B)
+            variables = model.addVars(range(k_A), range(k_B), name="z", lb=0)
+            # Insertion order of the variables is row-major, matching cost_matrix.ravel()
+            flat_variables = variables.values()
 
             # Set the objective of the linear program to minimize the total cost.
-            model.setObjective(quicksum(distance_matrix[node_to_index[x]][node_to_index[y]] * variables[x, y]
-                                for x in mu_A for y in mu_B), GRB.MINIMIZE)
+            model.setObjective(quicksum(cost * variable for cost, variable in zip(cost_matrix.ravel().tolist(), flat_variables)),
+                               GRB.MINIMIZE)
 
             # Add constraints to ensure the conservation of mass.
-            for x in mu_A:
-                model.addConstr(quicksum(variables[x, y] for y in mu_B) == mu_A[x], f"dirt_leaving_{x}")
+            for a in range(k_A):
+                model.addConstr(quicksum(variables[a, b] for b in range(k_B)) == distribution1[a], f"dirt_leaving_{nodes_A[a]}")
 
-            for y in mu_B:
-                model.addConstr(quicksum(variables[x, y] for x in mu_A) == mu_B[y], f"dirt_filling_{y}")
+            for b in range(k_B):
+                model.addConstr(quicksum(variables[a, b] for a in range(k_A)) == distribution2[b], f"dirt_filling_{nodes_B[b]}")
 
             # Start the timer, solve the model, and calculate the time taken.
             start_time = time.time()
@@ -334,11 +528,11 @@ class UndirectedHypergraph:
                 total_cost = model.getObjective().getValue()
                 print("Total EMD Cost:", total_cost)
                 print("Time taken to find the optimal solution: {:.4f} seconds".format(time_taken))
-                for x in mu_A:
-                    for y in mu_B:
-                        amount_moved = variables[x, y].X
+                for a in range(k_A):
+                    for b in range(k_B):
+                        amount_moved = variables[a, b].X
                         if amount_moved > 0:
-                            print(f"Move {amount_moved} from {x} to {y}")
+                            print(f"Move {amount_moved} from {nodes_A[a]} to {nodes_B[b]}")
                 return total_cost
             else:
                 print("No optimal solution found.")
@@ -348,10 +542,72 @@ class UndirectedHypergraph:
             print(f"Gurobi Error: {e}")
             return None
 
-    def earthmover_distance_hyperedge_combinations(self, hyperedge_id, distance_matrix):
+    def earthmover_distances_gurobi_shared_model(self, pairs, distance_matrix):
+        """
+        Solve the EMD of several node pairs with a single Gurobi model.
+
+        The model is built once over the union S of the pairs' supports (variables S x S, costs from
+        the distance matrix); each pair only changes the right-hand sides of the mass constraints, so
+        Gurobi warm-starts every solve from the previous basis.
+
+        :param pairs: Iterable of (node_A, node_B).
+        :param distance_matrix: Distance matrix indexed in node_index() order.
+        :return: A dict mapping frozenset({node_A, node_B}) to its EMD (pairs without an optimal solution are left out).
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return {}
+
+        supports = {node: self.node_probability(node) for pair in pairs for node in pair}
+        support = np.unique(np.concatenate([idx for idx, _ in supports.values()]))
+        k = len(support)
+        cost_matrix = distance_matrix[np.ix_(support, support)]
+        node_list, _ = self.node_index()
+
+        emds = {}
+        try:
+            _load_gurobi()
+            model = Model("EarthMoverDistance")
+            variables = model.addVars(range(k), range(k), name="z", lb=0)
+            # Insertion order of the variables is row-major, matching cost_matrix.ravel()
+            model.setObjective(quicksum(cost * variable for cost, variable in zip(cost_matrix.ravel().tolist(), variables.values())),
+                               GRB.MINIMIZE)
+
+            # Mass constraints start empty; their right-hand sides are set per pair
+            leaving = [model.addConstr(quicksum(variables[a, b] for b in range(k)) == 0, f"dirt_leaving_{node_list[support[a]]}")
+                       for a in range(k)]
+            filling = [model.addConstr(quicksum(variables[a, b] for a in range(k)) == 0, f"dirt_filling_{node_list[support[b]]}")
+                       for b in range(k)]
+
+            for node_A, node_B in pairs:
+                for constraints, node in ((leaving, node_A), (filling, node_B)):
+                    idx, probabilities = supports[node]
+                    mass = np.zeros(k)
+                    mass[np.searchsorted(support, idx)] = probabilities
+                    model.setAttr("RHS", constraints, mass.tolist())
+
+                start_time = time.time()
+                model.optimize()
+                end_time = time.time()
+
+                if model.status == GRB.OPTIMAL:
+                    total_cost = model.ObjVal
+                    print("Total EMD Cost:", total_cost)
+                    print("Time taken to find the optimal solution: {:.4f} seconds".format(end_time - start_time))
+                    emds[frozenset((node_A, node_B))] = total_cost
+                else:
+                    print(f"No optimal solution found for {node_A} and {node_B}.")
+
+        except Exception as e:
+            print(f"Gurobi Error: {e}")
+
+        return emds
+
+    def earthmover_distance_hyperedge_combinations(self, hyperedge_id, distance_matrix, use_gurobi=False):
         """
 
         :param hyperedge_id: The identifier for the hyperedge.
+        :param use_gurobi: Solve each EMD with the Gurobi LP instead of POT.
         :return: The average EMD for all permutations of node pairs, or None if the hyperedge does not exist or has errors.
         """
         if hyperedge_id not in self.hyperedges:
@@ -362,12 +618,29 @@ class UndirectedHypergraph:
         print(nodes)
         if len(nodes) < 2:
             return 1
-        
+
+        # All node pairs of the hyperedge as index arrays, in the order combinations(nodes, 2) would give
+        nodes = list(nodes)
+        pair_i, pair_j = np.triu_indices(len(nodes), k=1)
+        pairs = [(nodes[i], nodes[j]) for i, j in zip(pair_i.tolist(), pair_j.tolist())]
+
+        if use_gurobi or ot is None:
+            # Solve every uncached pair of this hyperedge on one warm-started Gurobi model
+            pending = [(node_A, node_B) for node_A, node_B in pairs
+                       if frozenset((node_A, node_B)) not in self._emd_cache]
+            self._emd_cache.update(self.earthmover_distances_gurobi_shared_model(pending, distance_matrix))
+
         sum_emd = 0
         pair_count = 0
-        # Generate all combinations of pairs of nodes
-        for node_A, node_B in combinations(nodes, 2):
-            emd = self.earthmover_distance_gurobi_distance_matrix(node_A, node_B, distance_matrix)
+        for node_A, node_B in pairs:
+            # The same pair co-occurs in many hyperedges; EMD is symmetric so key on the unordered pair
+            pair = frozenset((node_A, node_B))
+            if pair in self._emd_cache:
+                emd = self._emd_cache[pair]
+            else:
+                emd = self.earthmover_distance_gurobi_distance_matrix(node_A, node_B, distance_matrix, use_gurobi)
+                if emd is not None:
+                    self._emd_cache[pair] = emd
             if emd is not None:
                 sum_emd += emd
                 pair_count += 1
@@ -376,7 +649,7 @@ class UndirectedHypergraph:
             # Compute the average EMD
             average_emd = sum_emd /pair_count
             print(f"Calculated EMD for hyperedge {hyperedge_id} considering all combinations: {average_emd}")
-            weight = self.weights[hyperedge_id][-1]
+            weight = self.current_weight(hyperedge_id)
             if weight == 0:
                 return 1 - average_emd
             else:
@@ -385,6 +658,75 @@ class UndirectedHypergraph:
             print("No valid EMD computations were possible.")
             return None
 
+    def hyperedge_orcs_parallel(self, distance_matrix, max_workers=None):
+        """
+        Compute the ORC of every hyperedge across a process pool (POT backend).
+
+        Node probabilities are computed once up front and the distance matrix is shared with the
+        workers through shared memory. Falls back to earthmover_distance_hyperedge_combinations
+        when POT is not installed.
+
+        :param distance_matrix: Distance matrix indexed in node_index() order.
+        :param max_workers: Number of worker processes (defaults to the CPU count).
+        :return: A list of (hyperedge_id, orc) in self.hyperedges order.
+        """
+        if ot is None:
+            return [(hyperedge_id, self.earthmover_distance_hyperedge_combinations(hyperedge_id, distance_matrix))
+                    for hyperedge_id in self.hyperedges]
+
+        supports = {node: self.node_probability(node) for node in self.nodes}
+
+        tasks = [(hyperedge_id, [supports[node] for node in nodes], self.current_weight(hyperedge_id))
+                 for hyperedge_id, nodes in self.hyperedges.items()]
+        if not tasks:
+            return []
+
+        matrix = np.ascontiguousarray(distance_matrix, dtype=np.float64)
+        shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        try:
+            np.ndarray(matrix.shape, dtype=np.float64, buffer=shm.buf)[:] = matrix
+            # Spawn fresh workers: forking after Numba has started its thread pool is not safe
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_attach_distance_matrix,
+                                     initargs=(shm.name, matrix.shape)) as executor:
+                chunksize = max(1, len(tasks) // (4 * (max_workers or multiprocessing.cpu_count())))
+                return list(executor.map(_compute_hyperedge_orc, *zip(*tasks), chunksize=chunksize))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def adjacency(self):
+        """
+        Adjacency of the clique expansion as integer arrays: entry i holds the node_index() positions
+        of every node sharing a hyperedge with node i (including i itself).
+
+        :return: A list of np.ndarray, one per node.
+        """
+        if self._adj is None:
+            H = self.incidence_matrix()
+            A = (H @ H.T).tocsr()
+            self._adj = [A.indices[A.indptr[i]:A.indptr[i + 1]] for i in range(A.shape[0])]
+        return self._adj
+
+    def _bfs_component(self, start, visited):
+        """
+        Breadth-first search over adjacency() from node position start, marking visited in place.
+
+        :return: The list of node positions reached.
+        """
+        adj = self.adjacency()
+        visited[start] = True
+        component = [start]
+        queue = deque([start])
+        while queue:
+            neighbours = adj[queue.popleft()]
+            new = neighbours[~visited[neighbours]]
+            if new.size:
+                visited[new] = True
+                new = new.tolist()
+                component.extend(new)
+                queue.extend(new)
+        return component
 
     def check_weak_connectivity(self):
         """
@@ -396,21 +738,12 @@ class UndirectedHypergraph:
         if not self.nodes:
             return True  # An empty hypergraph or one with no nodes is trivially connected.
 
-        start_node = next(iter(self.nodes))  # Get an arbitrary starting node
-        visited = set()
-        queue = deque([start_node])
+        # Perform a breadth-first search (BFS) from an arbitrary node to find all reachable nodes
+        visited = np.zeros(len(self.node_index()[0]), dtype=bool)
+        self._bfs_component(0, visited)
 
-        # Perform a breadth-first search (BFS) to find all reachable nodes
-        while queue:
-            current = queue.popleft()
-            if current not in visited:
-                visited.add(current)
-                for neighbor in self.neighbours(current):
-                    if neighbor not in visited:
-                        queue.append(neighbor)
-
-        # If the size of the visited set is the same as the number of nodes, all nodes are connected
-        return len(visited) == len(self.nodes)
+        # If every node was visited, all nodes are connected
+        return bool(visited.all())
     
     def connected_components(self):
       """
@@ -422,27 +755,17 @@ class UndirectedHypergraph:
       if not self.nodes:
           return []
 
-      visited = set()
+      node_list, _ = self.node_index()
+      visited = np.zeros(len(node_list), dtype=bool)
       components = []
 
-      for node in self.nodes:
-          if node not in visited:
-              # Start a new component
-              current_component = set()
-              queue = deque([node])
-
+      for start in range(len(node_list)):
+          if not visited[start]:
               # Perform BFS to find all nodes in this component
-              while queue:
-                  current = queue.popleft()
-                  if current not in visited:
-                      visited.add(current)
-                      current_component.add(current)
-                      # Enqueue all non-visited neighbors
-                      queue.extend(self.neighbours(current) - visited)
-
-              components.append(current_component)
+              components.append(self._bfs_component(start, visited))
 
-      return components
+      # Map node positions back to node names only at the end
+      return [{node_list[i] for i in component} for component in components]
     
     def remove_hyperedge(self, hyperedge_id):
         """
@@ -452,17 +775,25 @@ class UndirectedHypergraph:
         if hyperedge_id in self.hyperedges:
             # Retrieve the nodes in the hyperedge to be removed
             nodes_to_check = self.hyperedges.pop(hyperedge_id)
-            self.weights.pop(hyperedge_id, None)  # Safely remove weight entry if exists
-
-            # Determine if the nodes are part of any other hyperedges
-            nodes_to_remove = set(nodes_to_check)
-            for other_hyperedge_nodes in self.hyperedges.values():
-                nodes_to_remove.difference_update(other_hyperedge_nodes)
-                if not nodes_to_remove:
-                    break  # Exit early if all nodes are found in other hyperedges
+            # Keep the slot so earlier weight snapshots stay aligned; removed hyperedges read as nan
+            slot = self._edge_idx.pop(hyperedge_id)
+            self._edge_ids[slot] = None
+            self._current_weight[slot] = np.nan
+
+            # Nodes left without any incident hyperedge are no longer part of any other hyperedge
+            nodes_to_remove = set()
+            for node in nodes_to_check:
+                incident = self._incidence.get(node)
+                if incident is None:
+                    continue
+                incident.discard(hyperedge_id)
+                if not incident:
+                    del self._incidence[node]
+                    nodes_to_remove.add(node)
 
             # Remove nodes that are not in any other hyperedge
             self.nodes.difference_update(nodes_to_remove)
+            self._invalidate_structure()
             print(f"Removed hyperedge {hyperedge_id} and isolated nodes {nodes_to_remove}")
         else:
             print(f"Hyperedge ID {hyperedge_id} not found.")
@@ -499,165 +830,151 @@ class UndirectedHypergraph:
             
     
     
-df = pd.read_csv('/Users/Undirected Hypergraph/dataset_turingpapers_clean.csv')  #Add the data file here
-hypergraph = UndirectedHypergraph()
-hypergraph.build_from_dataframe(df)
+if __name__ == "__main__":
+    df = pd.read_csv('/Users/Undirected Hypergraph/dataset_turingpapers_clean.csv')  #Add the data file here
+    hypergraph = UndirectedHypergraph()
+    hypergraph.build_from_dataframe(df)
 
 
-def save_matrix_csv(matrix, filename):
-        pd.DataFrame(matrix).to_csv(filename, index=False, header=False)
+    def save_matrix_csv(matrix, filename):
+            pd.DataFrame(matrix).to_csv(filename, index=False, header=False)
 
-def load_matrix_csv(filename):
-    return pd.read_csv(filename, header=None).values
+    def load_matrix_csv(filename):
+        return pd.read_csv(filename, header=None).values
 
 
-print(len(hypergraph.nodes))
-print(len(hypergraph.hyperedges))
+    print(len(hypergraph.nodes))
+    print(len(hypergraph.hyperedges))
 
-print(hypergraph.check_weak_connectivity())
+    print(hypergraph.check_weak_connectivity())
 
-def calculate_degrees(hypergraph):
-    degrees = {}
+    def calculate_degrees(hypergraph):
+        degrees = {}
     
-    # Iterate over each node in the hypergraph
-    for node in hypergraph.nodes:
-        degrees[node] = hypergraph.node_degree(node)
-
-    # If there are no nodes or degrees calculated, handle the case gracefully
-    if not degrees:
-        max_degree = 0
-        min_degree = 0
-        avg_degree = 0.0
-    else:
-        max_degree = max(degrees.values())
-        min_degree = min(degrees.values())
-        avg_degree = sum(degrees.values()) / len(degrees)
+        # Iterate over each node in the hypergraph
+        for node in hypergraph.nodes:
+            degrees[node] = hypergraph.node_degree(node)
+
+        # If there are no nodes or degrees calculated, handle the case gracefully
+        if not degrees:
+            max_degree = 0
+            min_degree = 0
+            avg_degree = 0.0
+        else:
+            max_degree = max(degrees.values())
+            min_degree = min(degrees.values())
+            avg_degree = sum(degrees.values()) / len(degrees)
     
-    return max_degree, min_degree, avg_degree
-
-# Example usage:
-# Assuming 'hypergraph' is an instance of UndirectedHypergraph
-max_degree, min_degree, avg_degree = calculate_degrees(hypergraph)
-print(f"Max Degree: {max_degree}")
-print(f"Min Degree: {min_degree}")
-print(f"Average Degree: {avg_degree:.2f}")
-
+        return max_degree, min_degree, avg_degree
+
+    # Example usage:
+    # Assuming 'hypergraph' is an instance of UndirectedHypergraph
+    max_degree, min_degree, avg_degree = calculate_degrees(hypergraph)
+    print(f"Max Degree: {max_degree}")
+    print(f"Min Degree: {min_degree}")
+    print(f"Average Degree: {avg_degree:.2f}")
+
+
+    def adjusted_sigmoid_0_to_1(x):
+        # Clip x to a range that prevents overflow in exp.
+        # The range of -709 to 709 is chosen based on the practical limits of np.exp()
+            x_clipped = np.clip(x, -709, 709)
+            a, b = 0, 1  # Define the target range
+            return a + (b - a) / (1 + np.exp(-x_clipped))
+
+    def write_orc_rows(rows, file_name):
+        # Append one iteration's (hyperedge, ORC, weight) rows in a single write; only a new file gets the header
+        write_header = not os.path.exists(file_name) or os.path.getsize(file_name) == 0
+        pd.DataFrame(list(rows), columns=['Hyperedge ID', 'ORC', 'Weight']).to_csv(
+            file_name, mode='a', header=write_header, index=False)
+
+    def update_orc_and_weights(distance_matrix, file_name):
+            # EMDs from the previous iteration used the old distance matrix
+            hypergraph.clear_caches()
+            results = hypergraph.hyperedge_orcs_parallel(distance_matrix)
+            hyperedge_ids = [hyperedge_id for hyperedge_id, _ in results]
+            orcs = np.array([orc for _, orc in results], dtype=np.float64)
+            for hyperedge_id, orc in results:
+                hypergraph.add_ricci_curvature(hyperedge_id, orc)
+
+            # Update every weight with one vectorized sigmoid; hyperedges whose weight is 0 stay at 0
+            weights = hypergraph.current_weights(hyperedge_ids)
+            normalized_weights = np.where(weights != 0, adjusted_sigmoid_0_to_1(weights * (1 - orcs)), 0.0)
+            hypergraph.set_weights(hyperedge_ids, normalized_weights)
+
+            hypergraph.record_weights()
+            write_orc_rows(zip(hyperedge_ids, orcs, normalized_weights), file_name)
+
+    def update_orc_and_weights_iter(distance_matrix, iteration, file_format='csv'):
+            file_name = f'dataset_networkscience_normalized_weights_data_iteration_{iteration}.{file_format}'
 
-def adjusted_sigmoid_0_to_1(x):
-    # Clip x to a range that prevents overflow in exp.
-    # The range of -709 to 709 is chosen based on the practical limits of np.exp()
-        x_clipped = np.clip(x, -709, 709)
-        a, b = 0, 1  # Define the target range
-        return a + (b - a) / (1 + np.exp(-x_clipped))
-
-def update_orc_and_weights_iter(distance_matrix, iteration, file_format='csv'):
-        file_name = f'dataset_networkscience_normalized_weights_data_iteration_{iteration}.{file_format}'
-
-        with open(file_name, 'a', newline='') as file:
             if file_format == 'csv':
-                writer = csv.writer(file)
-                # Check if the file is empty to write headers
-                if file.tell() == 0:
-                    writer.writerow(['Hyperedge ID', 'ORC', 'Weight'])
+                update_orc_and_weights(distance_matrix, file_name)
 
-                for hyperedge_id in hypergraph.hyperedges:
-                    orc = hypergraph.earthmover_distance_hyperedge_combinations(hyperedge_id, distance_matrix)
-                    hypergraph.add_ricci_curvature(hyperedge_id, orc)
-                    weight = hypergraph.weights[hyperedge_id][-1]
-                    if weight != 0:
-                        
-                        weight = weight * (1 - orc)
-                        normalized_weight = adjusted_sigmoid_0_to_1(weight)
-                    else:
-                        normalized_weight = 0
+    def find_top_n_weighted_hyperedges(file_path, n):
 
+            # Load the CSV file
+            df = pd.read_csv(file_path)
 
-                    hypergraph.add_weights(hyperedge_id, normalized_weight)
+            # Sort the DataFrame based on the 'Weight' column in descending order
+            df_sorted = df.sort_values(by='Weight', ascending=False)
 
-                    writer.writerow([hyperedge_id, orc, normalized_weight])
+            # Select the top n rows and only the 'Hyperedge ID' column
+            top_n_hyperedges_ids = df_sorted.head(n)['Hyperedge ID'].tolist()
 
-def find_top_n_weighted_hyperedges(file_path, n):
+            # Select the top n rows
+            top_n_hyperedges = df_sorted.head(n)
 
-        # Load the CSV file
-        df = pd.read_csv(file_path)
+            return top_n_hyperedges_ids
 
-        # Sort the DataFrame based on the 'Weight' column in descending order
-        df_sorted = df.sort_values(by='Weight', ascending=False)
 
-        # Select the top n rows and only the 'Hyperedge ID' column
-        top_n_hyperedges_ids = df_sorted.head(n)['Hyperedge ID'].tolist()
+    def save_and_update(distance_matrix, iteration):
+            filename = f'distance_matrix_normalized_weights_{iteration}.csv'
+            save_matrix_csv(distance_matrix, filename)
+            update_orc_and_weights_iter(distance_matrix, iteration)
 
-        # Select the top n rows
-        top_n_hyperedges = df_sorted.head(n)
 
-        return top_n_hyperedges_ids
+    def delete_hyperedges(file_path, percentage=0.08):
+            total_hyperedges = len(hypergraph.hyperedges)
+            del_hyperedges = int(percentage * total_hyperedges)
+            hyperedges_to_remove = find_top_n_weighted_hyperedges(file_path, del_hyperedges)
+            for he in hyperedges_to_remove:
+                hypergraph.remove_hyperedge(he)
 
+    def write_hypergraph_stats(file_path, iteration):
+            with open(file_path, 'w') as file:
+                file.write(f"Number of reactions or hyperedges: {len(hypergraph.hyperedges)}\n")
+                file.write(f"Number of nodes or metabolites: {len(hypergraph.nodes)}\n")
+                connected = hypergraph.check_weak_connectivity()
+                file.write("The hypergraph is weakly connected:\n" if connected else "The hypergraph is not weakly connected.\n")
+                components = hypergraph.connected_components()
+                file.write(f"Connected Components: {components}\n")
+                file.write(f"No. of modules: {len(components)}\n")
+                # # Listing all hyperedges
+                file.write("\nList of all hyperedges:\n")
+                for hyperedge_id, edge_data in hypergraph.hyperedges.items():
+                    file.write(f"Hyperedge ID: {hyperedge_id}, Hyperedge: {edge_data}\n")
 
-def save_and_update(distance_matrix, iteration):
-        filename = f'distance_matrix_normalized_weights_{iteration}.csv'
-        save_matrix_csv(distance_matrix, filename)
-        update_orc_and_weights_iter(distance_matrix, iteration)
+    def update_orc_and_weights_iter0(distance_matrix, iteration, file_format='csv'):
+            file_name = f'dataset_networkscience_ORC_weights_iteration_{iteration}.{file_format}'
+        
+            if file_format == 'csv':
+                update_orc_and_weights(distance_matrix, file_name)
 
+    distance_matrix = hypergraph.calculate_distance_matrix()
 
-def delete_hyperedges(file_path, percentage=0.08):
-        total_hyperedges = len(hypergraph.hyperedges)
-        del_hyperedges = int(percentage * total_hyperedges)
-        hyperedges_to_remove = find_top_n_weighted_hyperedges(file_path, del_hyperedges)
-        for he in hyperedges_to_remove:
-            hypergraph.remove_hyperedge(he)
+    update_orc_and_weights_iter0(distance_matrix,iteration=0)
 
-def write_hypergraph_stats(file_path, iteration):
-        with open(file_path, 'w') as file:
-            file.write(f"Number of reactions or hyperedges: {len(hypergraph.hyperedges)}\n")
-            file.write(f"Number of nodes or metabolites: {len(hypergraph.nodes)}\n")
-            connected = hypergraph.check_weak_connectivity()
-            file.write("The hypergraph is weakly connected:\n" if connected else "The hypergraph is not weakly connected.\n")
-            components = hypergraph.connected_components()
-            file.write(f"Connected Components: {components}\n")
-            file.write(f"No. of modules: {len(components)}\n")
-            # # Listing all hyperedges
-            file.write("\nList of all hyperedges:\n")
-            for hyperedge_id, edge_data in hypergraph.hyperedges.items():
-                file.write(f"Hyperedge ID: {hyperedge_id}, Hyperedge: {edge_data}\n")
+    total_iterations = 40
+    for i in range(1, total_iterations + 1):
+        distance_matrix_i = hypergraph.floyd_warshall()
+        save_and_update(distance_matrix_i, i)
 
-def update_orc_and_weights_iter0(distance_matrix, iteration, file_format='csv'):
-        file_name = f'dataset_networkscience_ORC_weights_iteration_{iteration}.{file_format}'
-        
-        with open(file_name, 'a', newline='') as file:
-            if file_format == 'csv':
-                writer = csv.writer(file)
-                # Check if the file is empty to write headers
-                if file.tell() == 0:
-                    writer.writerow(['Hyperedge ID', 'ORC', 'Weight'])
-                
-                for hyperedge_id in hypergraph.hyperedges:
-                    orc = hypergraph.earthmover_distance_hyperedge_combinations(hyperedge_id, distance_matrix)
-                    hypergraph.add_ricci_curvature(hyperedge_id, orc)
-                    weight = hypergraph.weights[hyperedge_id][-1]
-                    if weight != 0:
-                        weight = weight * (1 - orc)
-                        normalized_weight = adjusted_sigmoid_0_to_1(weight)
-                    else:
-                        normalized_weight == 0
-
-                    hypergraph.add_weights(hyperedge_id, normalized_weight)
-                    
-                    writer.writerow([hyperedge_id, orc, normalized_weight])
-
-distance_matrix = hypergraph.calculate_distance_matrix()
-
-update_orc_and_weights_iter0(distance_matrix,iteration=0)
-
-total_iterations = 40
-for i in range(1, total_iterations + 1):
-    distance_matrix_i = hypergraph.floyd_warshall()
-    save_and_update(distance_matrix_i, i)
-
-    if i % 2 == 0:
-        file_path = f'dataset_networkscience_normalized_weights_data_iteration_{i}.csv'
-        delete_hyperedges(file_path)
-        stats_file_path = f'/Users//networkscience_8percentsurgery_RF_normalized{i // 2}.txt'
-        write_hypergraph_stats(stats_file_path, i)
+        if i % 2 == 0:
+            file_path = f'dataset_networkscience_normalized_weights_data_iteration_{i}.csv'
+            delete_hyperedges(file_path)
+            stats_file_path = f'/Users//networkscience_8percentsurgery_RF_normalized{i // 2}.txt'
+            write_hypergraph_stats(stats_file_path, i)
 
 
 